@@ -12,12 +12,15 @@ Sử dụng:
 """
 import json, os, sys
 
-# Kiểm tra openstacksdk có cài hay không (cần cho auto-discovery)
+# Kiểm tra orjson có cài hay không (optional - parse/serialize JSON nhanh hơn stdlib)
 try:
-    import openstack
-    SDK = True
+    import orjson
+    ORJSON = True
 except ImportError:
-    SDK = False
+    ORJSON = False
+
+# openstacksdk được import lười trong discover_resources() - import nặng,
+# không cần cho pass-through CLI mode
 
 # Kiểm tra rich library (optional - chỉ để UI đẹp hơn)
 try:
@@ -31,6 +34,25 @@ except ImportError:
     RICH = False
     console = None
 
+# Template terraform.tfvars - tách khỏi data, không build lại f-string mỗi lần export
+_TFVARS_TEMPLATE = """# Auto-generated from profile: {active}
+openstack_auth_url    = "{auth_url}"
+openstack_region      = "{region}"
+openstack_tenant_name = "{project_name}"
+openstack_user_name   = "{username}"
+openstack_password    = "{password}"
+"""
+
+def _atomic_write_bytes(path, data):
+    """Ghi file an toàn: ghi ra file tạm rồi os.replace (atomic rename)
+
+    Tránh mất cả config cũ lẫn mới nếu process bị kill giữa chừng khi ghi.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
 def msg(text, color=""):
     """In text với màu (nếu có rich library) hoặc plain text
     
@@ -61,6 +83,7 @@ class OpenStackConfigManager:
             self.config_file = config_file
         self.config = None  # Sẽ load từ JSON file
         self.active_profile = None  # Profile hiện tại (e.g., 'default')
+        self._active_cache = None  # Cache kết quả get_active_profile()
         
     def load_config(self):
         """Đọc config từ file JSON
@@ -71,10 +94,12 @@ class OpenStackConfigManager:
         if not os.path.exists(self.config_file):
             return None
         try:
-            with open(self.config_file, 'r') as f:
-                self.config = json.load(f)
+            with open(self.config_file, 'rb') as f:
+                raw = f.read()
+            self.config = orjson.loads(raw) if ORJSON else json.loads(raw)
             # Lấy profile đang active (default nếu không có)
             self.active_profile = self.config.get('active_profile', 'default')
+            self._active_cache = None
             return self.config
         except Exception as e:
             msg(f"Error: {e}", "red")
@@ -87,22 +112,29 @@ class OpenStackConfigManager:
             bool: True nếu lưu thành công, False nếu lỗi
         """
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            if ORJSON:
+                data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self.config, indent=2).encode()
+            _atomic_write_bytes(self.config_file, data)
             return True
         except Exception as e:
             msg(f"Error: {e}", "red")
             return False
     
-    def create_default_config(self):
+    def _init_empty_config(self):
+        """Khởi tạo cấu trúc config mặc định trong memory (chưa ghi file)"""
         self.config = {
             "profiles": {"default": {
                 "auth_url": "", "region": "RegionOne", "project_name": "",
-                "username": "", "password": "", 
+                "username": "", "password": "",
                 "user_domain_name": "Default", "project_domain_id": "default"
             }},
             "active_profile": "default"
         }
+
+    def create_default_config(self):
+        self._init_empty_config()
         self.save_config()
     
     def interactive_setup(self):
@@ -124,14 +156,16 @@ class OpenStackConfigManager:
             password = input("Password: ")
         
         if not self.config:
-            self.create_default_config()
-        
+            # Chỉ dựng config trong memory - save_config() ở cuối ghi một lần
+            self._init_empty_config()
+
         self.config['profiles'][profile_name] = {
             "auth_url": auth_url, "region": region, "project_name": project_name,
             "username": username, "password": password,
             "user_domain_name": "Default", "project_domain_id": "default"
         }
         self.config['active_profile'] = profile_name
+        self._active_cache = None
         self.save_config()
         msg(f"\n✓ Profile '{profile_name}' created", "green")
         return True
@@ -164,6 +198,7 @@ class OpenStackConfigManager:
             return False
         self.config['active_profile'] = profile_name
         self.active_profile = profile_name
+        self._active_cache = None
         self.save_config()
         msg(f"✓ Switched to '{profile_name}'", "green")
         return True
@@ -181,7 +216,10 @@ class OpenStackConfigManager:
         """
         if not self.config:
             return None
-        return self.config['profiles'].get(self.config.get('active_profile', 'default'))
+        # Cache kết quả - hàm này được gọi nhiều lần (discover, export, CLI)
+        if self._active_cache is None:
+            self._active_cache = self.config['profiles'].get(self.config.get('active_profile', 'default'))
+        return self._active_cache
     
     def discover_resources(self):
         """Tự động phát hiện tài nguyên OpenStack (external network, endpoints)
@@ -197,10 +235,13 @@ class OpenStackConfigManager:
             }
             None nếu không có openstacksdk hoặc xảy ra lỗi
         """
-        if not SDK:
+        try:
+            import openstack
+        except ImportError:
             msg("Install openstacksdk: pip install openstacksdk", "yellow")
             return None
-        
+
+
         profile = self.get_active_profile()
         if not profile:
             msg("No active profile", "red")
@@ -217,7 +258,8 @@ class OpenStackConfigManager:
             
             discovered = {}
             auto = self.config.get('auto_discover', {})
-            
+            dirty = False  # Gom các thay đổi profile, chỉ ghi file một lần ở cuối
+
             # Tìm external network (mặc định: bật)
             if auto.get('external_network', True):
                 nets = list(conn.network.networks(is_router_external=True))
@@ -227,17 +269,24 @@ class OpenStackConfigManager:
                     if 'external_network_name' not in profile:
                         profile['external_network_name'] = nets[0].name
                         self.config['profiles'][self.active_profile] = profile
-                        self.save_config()
-            
+                        dirty = True
+
             # Lấy danh sách public endpoints từ service catalog (mặc định: bật)
+            # next(...) dừng ngay khi gặp endpoint public đầu tiên của mỗi service
             if auto.get('endpoints', True):
-                discovered['endpoints'] = {}
-                for svc in conn.service_catalog:
-                    for ep in svc.get('endpoints', []):
-                        if ep.get('interface') == 'public':
-                            # Lưu endpoint theo service type (compute, network, image, etc.)
-                            discovered['endpoints'][svc.get('type')] = ep.get('url')
-            
+                endpoints = {
+                    svc.get('type'): next(
+                        (ep.get('url') for ep in svc.get('endpoints', ())
+                         if ep.get('interface') == 'public'),
+                        None
+                    )
+                    for svc in conn.service_catalog
+                }
+                # Lưu endpoint theo service type (compute, network, image, etc.)
+                discovered['endpoints'] = {k: v for k, v in endpoints.items() if v}
+
+            if dirty:
+                self.save_config()
             return discovered
         except Exception as e:
             msg(f"Discovery error: {e}", "red")
@@ -248,14 +297,22 @@ class OpenStackConfigManager:
         if not profile:
             return False
         
-        discovered = self.discover_resources()
-        content = f"""# Auto-generated from profile: {self.active_profile}
-openstack_auth_url    = "{profile['auth_url']}"
-openstack_region      = "{profile['region']}"
-openstack_tenant_name = "{profile['project_name']}"
-openstack_user_name   = "{profile['username']}"
-openstack_password    = "{profile['password']}"
-"""
+        # Nếu profile đã cache đủ thông tin external network thì khỏi gọi API
+        if profile.get('external_network_id') and profile.get('external_network_name'):
+            discovered = {'external_network': {
+                'id': profile['external_network_id'],
+                'name': profile['external_network_name']
+            }}
+        else:
+            discovered = self.discover_resources()
+            # Lưu id/name vào profile để các lần export sau dùng cache
+            if discovered and 'external_network' in discovered:
+                profile['external_network_id'] = discovered['external_network']['id']
+                profile['external_network_name'] = discovered['external_network']['name']
+                self.config['profiles'][self.active_profile] = profile
+                self.save_config()
+
+        content = _TFVARS_TEMPLATE.format_map({**profile, 'active': self.active_profile})
         if discovered and 'external_network' in discovered:
             net = discovered['external_network']
             content += f'\nexternal_network_id   = "{net["id"]}"\nexternal_network_name = "{net["name"]}"\n'
@@ -270,10 +327,9 @@ openstack_password    = "{profile['password']}"
             return False
 
 if __name__ == '__main__':
-    import argparse
-    import subprocess
-    
     # Kiểm tra nếu có 'openstack' command - pass-through mode
+    # Xử lý trước khi import argparse: nhánh này exec sang binary khác ngay,
+    # nên không trả phí import cho mỗi lệnh được wrap
     if len(sys.argv) > 1 and sys.argv[1] == 'openstack':
         mgr = OpenStackConfigManager()
         mgr.load_config()
@@ -293,16 +349,16 @@ if __name__ == '__main__':
         env['OS_USER_DOMAIN_NAME'] = profile.get('user_domain_name', 'Default')
         env['OS_PROJECT_DOMAIN_ID'] = profile.get('project_domain_id', 'default')
         
-        # Run openstack CLI với các args từ user
+        # Thay thế process hiện tại bằng openstack CLI (không fork, không chờ)
         cmd = ['openstack'] + sys.argv[2:]
         try:
-            result = subprocess.run(cmd, env=env)
-            sys.exit(result.returncode)
+            os.execvpe('openstack', cmd, env)
         except FileNotFoundError:
             msg("Error: 'openstack' CLI not found. Install: pip3 install python-openstackclient", "red")
             sys.exit(1)
     
     # Normal mode với argparse
+    import argparse
     parser = argparse.ArgumentParser(description="OpenStack Config Manager")
     parser.add_argument('action', choices=['setup', 'list', 'switch', 'discover', 'export'])
     parser.add_argument('--profile', help="Profile name")
@@ -324,6 +380,11 @@ if __name__ == '__main__':
     elif args.action == 'discover':
         result = mgr.discover_resources()
         if result:
-            print(json.dumps(result, indent=2))
+            if ORJSON:
+                # Ghi thẳng bytes ra stdout buffer, khỏi encode/flush qua print
+                sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+                sys.stdout.buffer.write(b"\n")
+            else:
+                print(json.dumps(result, indent=2))
     elif args.action == 'export':
         mgr.export_terraform_vars(args.output)
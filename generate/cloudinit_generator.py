@@ -13,6 +13,13 @@ from validate.userdata_schema import validate
 import hashlib
 import re
 
+# orjson tùy chọn - parse JSON bằng C, fallback về stdlib nếu thiếu
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 class literal_str(str):
     """Custom string class để force YAML dùng | style"""
     pass
@@ -25,7 +32,8 @@ class InlineDict(dict):
 
 def literal_presenter(dumper, data):
     """Custom presenter cho literal string"""
-    return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
+    # str(data): CEmitter (libyaml) không nhận str subclass làm scalar value
+    return dumper.represent_scalar('tag:yaml.org,2002:str', str(data), style='|')
 def inline_list_representer(dumper, data):
     """Custom presenter cho inline list"""
     return dumper.represent_sequence('tag:yaml.org,2002:seq', data, flow_style=True)
@@ -33,14 +41,24 @@ def inline_dict_representer(dumper, data):
     """Custom presenter cho inline dict"""
     return dumper.represent_mapping('tag:yaml.org,2002:map', data, flow_style=True)
 
-yaml.add_representer(literal_str, literal_presenter)
-yaml.add_representer(InlineList, inline_list_representer)
-yaml.add_representer(InlineDict, inline_dict_representer)
+# Dùng CDumper (libyaml, C-accelerated) nếu có - nhanh hơn pure-Python Dumper
+# nhiều lần; representer phải đăng ký trên cả hai class
+_DUMPER = getattr(yaml, 'CDumper', yaml.Dumper)
+for _dumper_cls in {yaml.Dumper, _DUMPER}:
+    _dumper_cls.add_representer(literal_str, literal_presenter)
+    _dumper_cls.add_representer(InlineList, inline_list_representer)
+    _dumper_cls.add_representer(InlineDict, inline_dict_representer)
+
+
+def dump_yaml(cloud_config: Dict[str, Any]) -> str:
+    """Serialize cloud-config dict sang YAML (giữ thứ tự key, block style)"""
+    return yaml.dump(cloud_config, Dumper=_DUMPER, default_flow_style=False, sort_keys=False)
+
+# Compile một lần ở module scope - parse_apt_version được gọi cho từng package
+_APT_VERSION_RE = re.compile(r'^(\d+:)?[\d\.\+\~]+.*$')
 
 def parse_apt_version(ensure_value):
-    apt_version_pattern = r'^(\d+:)?[\d\.\+\~]+.*$'
-    
-    if ensure_value not in ["present", "latest", "absent"] and re.match(apt_version_pattern, ensure_value):
+    if ensure_value not in ["present", "latest", "absent"] and _APT_VERSION_RE.match(ensure_value):
         return True, ensure_value
     return False, None
 
@@ -911,8 +929,10 @@ def main():
     print("Validation passed. Starting conversion...\n")
     
     try:
-        with open(args.input, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(args.input, "rb") as f:
+            raw = f.read()
+        # orjson.JSONDecodeError kế thừa json.JSONDecodeError nên except bên dưới bắt cả hai
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
     except FileNotFoundError:
         print(f"Error: file not found: {args.input}", file=sys.stderr)
         sys.exit(1)
@@ -924,7 +944,7 @@ def main():
     
     # Add cloud-config header
     output = "#cloud-config\n"
-    output += yaml.dump(cloud_config, default_flow_style=False, sort_keys=False)
+    output += dump_yaml(cloud_config)
     
     if args.output:
         with open(args.output, "w", encoding="utf-8") as f:
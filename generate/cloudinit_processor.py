@@ -3,11 +3,22 @@
 Cloud-Init Processor Module
 Integrates cloud-init into generate workflow
 """
+import contextlib
+import io
+import json
 import os
 import sys
 import subprocess
+from functools import lru_cache
 from typing import Optional, Dict
 
+# orjson tùy chọn - parse JSON bằng C, fallback về stdlib nếu thiếu
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Rich library for beautiful CLI output
 try:
     from rich.console import Console
@@ -21,17 +32,27 @@ except ImportError:
 CLOUD_INIT_ROOT = os.path.dirname(__file__)
 CLOUD_INIT_USERDATA_DIR = os.path.join(CLOUD_INIT_ROOT, "userdata")
 
+# Probe script generator một lần ở module load thay vì os.path.exists mỗi instance
+GENERATOR_SCRIPT = os.path.join(CLOUD_INIT_ROOT, "cloudinit_generator.py")
+GENERATOR_SCRIPT_EXISTS = os.path.exists(GENERATOR_SCRIPT)
+
+
+# Windows indicators in image names
+WINDOWS_KEYWORDS = ('windows', 'win', 'server-2016', 'server-2019', 'server-2022')
 
+
+@lru_cache(maxsize=64)
 def detect_os_type(image_name: str) -> str:
     """
     Detect OS type from image name
     Returns: 'windows' or 'linux'
+
+    Cached per unique image name - fleets reuse the same few images, so the
+    lower() + substring scans run once per image instead of once per instance.
     """
     image_lower = image_name.lower()
 
-    # Check for Windows indicators
-    windows_keywords = ['windows', 'win', 'server-2016', 'server-2019', 'server-2022']
-    if any(keyword in image_lower for keyword in windows_keywords):
+    if any(keyword in image_lower for keyword in WINDOWS_KEYWORDS):
         return 'windows'
 
     # Default to Linux for Ubuntu, CentOS, RHEL, Debian, etc.
@@ -58,9 +79,25 @@ def find_cloud_init_json(cloud_init_filename: str) -> Optional[str]:
     return None
 
 
+# Generator module, import lười một lần (None = chưa thử, False = không import được)
+_GENERATOR = None
+
+
+def _load_generator():
+    global _GENERATOR
+    if _GENERATOR is None:
+        try:
+            sys.path.insert(0, os.path.dirname(CLOUD_INIT_ROOT))
+            from generate import cloudinit_generator
+            _GENERATOR = cloudinit_generator
+        except ImportError:
+            _GENERATOR = False
+    return _GENERATOR
+
+
 def generate_cloud_config(json_path: str, os_type: str, output_path: str) -> bool:
     """
-    Generate cloud-config using external cloudinit_generator.py script
+    Generate cloud-config using cloudinit_generator (in-process when importable)
 
     Args:
         json_path: Path to cloud-init JSON file
@@ -69,11 +106,36 @@ def generate_cloud_config(json_path: str, os_type: str, output_path: str) -> boo
 
     Returns: True if successful, False otherwise
     """
+    # Chạy generator trực tiếp trong process: khỏi tốn interpreter startup +
+    # re-import json/yaml/jsonschema cho từng instance
+    generator = _load_generator()
+    if generator:
+        try:
+            # Gom stdout của validate/convert lại như capture_output cũ
+            with contextlib.redirect_stdout(io.StringIO()):
+                if not generator.validate(json_path):
+                    raise ValueError("validation failed")
+                with open(json_path, "rb") as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                output = "#cloud-config\n" + generator.dump_yaml(
+                    generator.convert_to_cloud_config(data)
+                )
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(output)
+            return True
+        except Exception as e:
+            if RICH_AVAILABLE:
+                console.print(f"      [red]✗[/red] Generator failed")
+            else:
+                print(f"    ✗ Generator failed: {e}")
+            return False
+
+    # Fallback: chạy generator qua subprocess như trước
     try:
-        # Path to generator script trong generate/
-        generator_script = os.path.join(CLOUD_INIT_ROOT, "cloudinit_generator.py")
+        generator_script = GENERATOR_SCRIPT
 
-        if not os.path.exists(generator_script):
+        if not GENERATOR_SCRIPT_EXISTS:
             if RICH_AVAILABLE:
                 console.print(f"      [red]✗[/red] Generator script not found")
             else:
@@ -233,12 +295,17 @@ def process_all_instances(topology: Dict, validated_resources: Dict, output_dir:
         if not cloud_init_filename:
             continue
 
-        # Find the original name by stripping suffix if present
-        original_name = None
-        for orig_name in validated_map.keys():
-            if instance_name == orig_name or instance_name.startswith(orig_name + '_'):
-                original_name = orig_name
-                break
+        # Find the original name by stripping suffix if present: exact dict hit
+        # first (the common case), only fall back to the O(N) prefix scan when
+        # the name carries a suffix
+        if instance_name in validated_map:
+            original_name = instance_name
+        else:
+            original_name = None
+            for orig_name in validated_map.keys():
+                if instance_name.startswith(orig_name + '_'):
+                    original_name = orig_name
+                    break
 
         if not original_name:
             if RICH_AVAILABLE:
@@ -1,6 +1,7 @@
 import os
 import sys
 import subprocess
+from collections import deque
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 
@@ -17,6 +18,10 @@ except ImportError:
     RICH_AVAILABLE = False
     console = None
 
+# Terraform graph-walk parallelism for apply/destroy (default -parallelism=10
+# serializes cloud API calls on larger topologies); override via TF_PARALLELISM
+TF_PARALLELISM = int(os.environ.get("TF_PARALLELISM", "30"))
+
 # Store error messages for display after parallel execution
 error_messages = {}
 # Store success summaries (resources added/changed/destroyed)
@@ -24,21 +29,26 @@ success_summaries = {}
 
 import re
 
+# Compiled once at module load instead of re-parsing the patterns per folder.
+# Matches "Apply complete! Resources: 5 added, 0 changed, 0 destroyed."
+# or "Destroy complete! Resources: 3 destroyed."
+_ADDED_RE = re.compile(r'(\d+)\s+added')
+_CHANGED_RE = re.compile(r'(\d+)\s+changed')
+_DESTROYED_RE = re.compile(r'(\d+)\s+destroyed')
+
 def parse_terraform_summary(output):
     """Parse terraform output to extract resource summary"""
     summary = {"added": 0, "changed": 0, "destroyed": 0}
 
-    # Match patterns like "Apply complete! Resources: 5 added, 0 changed, 0 destroyed."
-    # Or "Destroy complete! Resources: 3 destroyed."
-    match = re.search(r'(\d+)\s+added', output)
+    match = _ADDED_RE.search(output)
     if match:
         summary["added"] = int(match.group(1))
 
-    match = re.search(r'(\d+)\s+changed', output)
+    match = _CHANGED_RE.search(output)
     if match:
         summary["changed"] = int(match.group(1))
 
-    match = re.search(r'(\d+)\s+destroyed', output)
+    match = _DESTROYED_RE.search(output)
     if match:
         summary["destroyed"] = int(match.group(1))
 
@@ -47,6 +57,10 @@ def parse_terraform_summary(output):
 # Store live logs for display
 live_logs = {}
 
+def is_initialized(folder):
+    """Check if a folder already has providers/modules installed by terraform init"""
+    return (folder / ".terraform").is_dir() and (folder / ".terraform.lock.hcl").is_file()
+
 # Run a Terraform command inside a specific folder (thread-safe version)
 def run_command_safe(folder, command):
     global error_messages, success_summaries, live_logs
@@ -71,8 +85,10 @@ def run_command_safe(folder, command):
                     print(f"Error: terraform init failed in {folder.name}")
             return exit_code
 
-        # For commands that modify state, ensure modules/providers are installed first
-        if command in ("apply", "destroy"):
+        # For commands that modify state, ensure modules/providers are installed
+        # first - but skip the extra terraform cold start when a previous init
+        # already populated .terraform/ and the lock file
+        if command in ("apply", "destroy") and not is_initialized(folder):
             if not RICH_AVAILABLE:
                 print(f"Running 'terraform init' in {folder.name} before '{command}'...")
             init_result = subprocess.run(["terraform", "init", "-no-color"], cwd=str(folder.absolute()), capture_output=True, text=True, env=env)
@@ -84,12 +100,19 @@ def run_command_safe(folder, command):
 
         # Run the actual command (apply/destroy) with auto-approve where appropriate
         if command in ("apply", "destroy"):
-            cmd = ["terraform", command, "-auto-approve", "-no-color"]
+            cmd = ["terraform", command, "-auto-approve", "-no-color", f"-parallelism={TF_PARALLELISM}"]
         else:
             cmd = ["terraform", command, "-no-color"]
 
-        # Stream output in real-time (env already set above)
-        full_output = []
+        # Stream output in real-time (env already set above). The error report
+        # shows at most the last 30 lines, so cap retention at capture time
+        # rather than truncating at display time. The success summary is NOT
+        # read from this buffer: apply prints the Outputs: block after "Apply
+        # complete!", which can push the summary line out of any fixed tail,
+        # so it is matched per-line during streaming instead
+        full_output = deque(maxlen=40)
+        tail = deque(maxlen=3)
+        summary = {"added": 0, "changed": 0, "destroyed": 0}
         process = subprocess.Popen(
             cmd,
             cwd=str(folder.absolute()),
@@ -104,8 +127,12 @@ def run_command_safe(folder, command):
         for line in process.stdout:
             line = line.rstrip()
             full_output.append(line)
+            tail.append(line)
             # Store latest lines for live display
-            live_logs[folder.name] = full_output[-3:]  # Keep last 3 lines
+            live_logs[folder.name] = list(tail)  # Keep last 3 lines
+            # "Apply complete! Resources: ..." / "Destroy complete! Resources: ..."
+            if "complete! Resources:" in line:
+                summary = parse_terraform_summary(line)
 
         process.wait()
         exit_code = process.returncode
@@ -117,8 +144,8 @@ def run_command_safe(folder, command):
             if not RICH_AVAILABLE:
                 print(f"Error in {folder.name}")
         else:
-            # Parse and store success summary
-            success_summaries[folder.name] = parse_terraform_summary(output_text)
+            # Store the summary matched while streaming
+            success_summaries[folder.name] = summary
 
         # Clear live log
         live_logs.pop(folder.name, None)
@@ -147,11 +174,15 @@ def run_parallel(command):
     # Check if shared VPC folder exists
     shared_vpc = current_dir / "00-shared-vpc"
 
-    # Find all subdirectories that start with 'openstack_' or 'aws_'
-    folders = [
-        d for d in current_dir.iterdir()
-        if d.is_dir() and (d.name.startswith("openstack_") or d.name.startswith("aws_"))
-    ]
+    # Find all subdirectories that start with 'openstack_' or 'aws_'.
+    # os.scandir gets the entry type from the directory listing itself, so the
+    # name filter runs first and regular directories avoid a per-entry stat
+    # call; is_dir() still follows symlinks so linked project folders count
+    with os.scandir(current_dir) as entries:
+        folders = [
+            Path(entry.path) for entry in entries
+            if entry.name.startswith(("openstack_", "aws_")) and entry.is_dir()
+        ]
 
     # If no valid folders are found, exit early
     if not folders and not shared_vpc.exists():
@@ -177,8 +208,8 @@ def run_parallel(command):
             print("\n=== Processing Shared VPC First ===")
             print(f"Running terraform {command} in 00-shared-vpc...")
 
-        # Run terraform init first if command is apply
-        if command == "apply":
+        # Run terraform init first if command is apply (skip when already initialized)
+        if command == "apply" and not is_initialized(shared_vpc):
             if RICH_AVAILABLE:
                 with console.status("[dim]Running terraform init...[/dim]", spinner="dots"):
                     init_result = subprocess.run(
@@ -205,7 +236,7 @@ def run_parallel(command):
         if command == "init":
             cmd = ["terraform", command]
         else:
-            cmd = ["terraform", command, "-auto-approve"]
+            cmd = ["terraform", command, "-auto-approve", f"-parallelism={TF_PARALLELISM}"]
 
         if RICH_AVAILABLE:
             with console.status(f"[dim]Running terraform {command}...[/dim]", spinner="dots"):
@@ -328,10 +359,12 @@ def run_parallel(command):
             # Summary
             success = results.count(0)
 
-            # Calculate totals
-            total_added = sum(s.get("added", 0) for s in success_summaries.values())
-            total_changed = sum(s.get("changed", 0) for s in success_summaries.values())
-            total_destroyed = sum(s.get("destroyed", 0) for s in success_summaries.values())
+            # Calculate totals in a single pass over the summaries
+            total_added = total_changed = total_destroyed = 0
+            for s in success_summaries.values():
+                total_added += s.get("added", 0)
+                total_changed += s.get("changed", 0)
+                total_destroyed += s.get("destroyed", 0)
 
             if success == len(folders):
                 console.print(f"\n[green bold]✓ All {len(folders)} folder(s) succeeded[/green bold]")
@@ -377,7 +410,7 @@ def run_parallel(command):
             console.print(f"\n[cyan]Destroying Shared VPC...[/cyan]")
             with console.status("[dim]Running terraform destroy...[/dim]", spinner="dots"):
                 result = subprocess.run(
-                    ["terraform", "destroy", "-auto-approve"],
+                    ["terraform", "destroy", "-auto-approve", f"-parallelism={TF_PARALLELISM}"],
                     cwd=str(shared_vpc.absolute()),
                     capture_output=True,
                     text=True
@@ -397,7 +430,7 @@ def run_parallel(command):
         else:
             print("\n=== Destroying Shared VPC ===")
             result = subprocess.run(
-                ["terraform", "destroy", "-auto-approve"],
+                ["terraform", "destroy", "-auto-approve", f"-parallelism={TF_PARALLELISM}"],
                 cwd=str(shared_vpc.absolute()),
                 capture_output=False
             )
@@ -26,6 +26,7 @@ DEPENDENCIES:
 ═══════════════════════════════════════════════════════════════════════════════
 """
 import json
+import re
 import uuid
 import sys
 import os
@@ -37,7 +38,26 @@ ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
 PROVIDERS_DIR = os.path.join(ROOT_DIR, "providers")
 sys.path.insert(0, ROOT_DIR)
 
-from validate.topology_schema import validate_topology_file
+from validate.topology_schema import validate_topology_data, validate_topology_file
+
+# Pattern thay default của variable block trong variables.tf, compile sẵn một
+# lần (DOTALL vì block variable trải nhiều dòng)
+_VAR_DEFAULT_RES = {
+    name: re.compile(r'(variable "%s".*?default\s*=\s*)"[^"]*"' % name, re.DOTALL)
+    for name in (
+        "openstack_user_name",
+        "openstack_password",
+        "external_network_id",
+        "external_network_name",
+    )
+}
+
+# orjson là optional - serialize/parse JSON nhanh hơn stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # OpenStack config manager
 try:
@@ -69,6 +89,7 @@ from clone.topology_cloner import (
     modify_topology,
 )
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from generate import cloudinit_processor as cloud_init_processor
 
 # Rich library for colored terminal output
@@ -83,6 +104,18 @@ except ImportError:
     console = None
 
 
+def _json_loads(raw):
+    """Parse JSON bytes/str bằng orjson nếu có, fallback stdlib"""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _json_dumps(obj):
+    """Serialize object -> JSON bytes (indent=2), orjson nếu có"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
 class TerraformGenerator:
     """Main class for generating Terraform configurations from topology.json"""
 
@@ -94,6 +127,7 @@ class TerraformGenerator:
         self.openstack_config = None
         self.discovered_resources = None
         self.validated_resources = None
+        self._parsed = {}  # Cache JSON đã parse, key theo (path, mtime)
         self.run()
 
     def run(self):
@@ -134,17 +168,30 @@ class TerraformGenerator:
             print(f"\n=== Start generating files for {self.provider.upper()} ===")
 
         # Step 0: Load OpenStack configuration if using OpenStack provider
+        # Discovery is a network round-trip and independent of the local
+        # topology validation below, so run it in the background and join
+        # before the config is first needed
+        config_future = None
+        executor = None
         if self.provider == 'openstack':
-            if not self.load_openstack_config():
-                if RICH_AVAILABLE:
-                    console.print("[yellow]! No OpenStack config found, using defaults[/yellow]")
-                else:
-                    print("! No OpenStack config found, using defaults")
+            executor = ThreadPoolExecutor(max_workers=1)
+            config_future = executor.submit(self.load_openstack_config)
 
         # Step 1: Load and validate topology.json
         if not self.load_and_validate_topology():
+            if executor:
+                executor.shutdown(wait=False)
             sys.exit(1)
 
+        # Join the background config load before its results are used
+        if config_future is not None:
+            if not config_future.result():
+                if RICH_AVAILABLE:
+                    console.print("[yellow]! No OpenStack config found, using defaults[/yellow]")
+                else:
+                    print("! No OpenStack config found, using defaults")
+            executor.shutdown()
+
         # Step 2: Validate cloud resources (images, flavors, etc.)
         self.validate_resources()
 
@@ -200,12 +247,9 @@ class TerraformGenerator:
             
             self.openstack_config = profile
             
-            # Auto-discover resources
-            if RICH_AVAILABLE:
-                with console.status("[dim]Discovering OpenStack resources...[/dim]", spinner="dots"):
-                    self.discovered_resources = manager.discover_resources()
-            else:
-                self.discovered_resources = manager.discover_resources()
+            # Auto-discover resources (no console.status here: this may run in
+            # a background thread while validation renders its own spinner)
+            self.discovered_resources = manager.discover_resources()
             
             if self.discovered_resources:
                 if RICH_AVAILABLE:
@@ -223,14 +267,42 @@ class TerraformGenerator:
                 console.print(f"[yellow]! Error loading config: {e}[/yellow]")
             return False
 
+    def _load_json(self, path):
+        """Parse a JSON file with an (path, mtime) keyed cache
+
+        The AI fixer rewrites topology.json in place, which bumps the mtime
+        and naturally invalidates the cached parse.
+        """
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns)
+        if key not in self._parsed:
+            with open(path, 'rb') as f:
+                self._parsed[key] = _json_loads(f.read())
+        return self._parsed[key]
+
+    def _read_topology(self):
+        """Parse topology.json; returns the dict or None on read error"""
+        try:
+            return self._load_json("topology.json")
+        except Exception as e:
+            if RICH_AVAILABLE:
+                console.print(f"[red]✗[/red] Error reading file: {str(e)}")
+            else:
+                print(f"\nError reading file: {str(e)}")
+            return None
+
     def load_and_validate_topology(self):
-        """Load topology.json and validate against schema + network logic"""
+        """Load topology.json once and validate against schema + network logic"""
+        topology = self._read_topology()
+        if topology is None:
+            return False
+
         if RICH_AVAILABLE:
             with console.status("[dim]Validating topology.json...[/dim]", spinner="dots"):
-                is_valid, errors = validate_topology_file("topology.json", self.provider)
+                is_valid, errors = validate_topology_data(topology, self.provider)
         else:
             print("\nChecking topology.json...")
-            is_valid, errors = validate_topology_file("topology.json", self.provider)
+            is_valid, errors = validate_topology_data(topology, self.provider)
 
         # Handle validation errors
         if not is_valid:
@@ -244,13 +316,16 @@ class TerraformGenerator:
                     print(f"- {error}")
 
             # Attempt AI auto-fix if available
-            if self._try_ai_autofix(errors):
-                # Re-validate after AI fix
+            if self._try_ai_autofix(topology, errors):
+                # Re-read and re-validate after AI fix (file was rewritten)
+                topology = self._read_topology()
+                if topology is None:
+                    return False
                 if RICH_AVAILABLE:
                     with console.status("[dim]Re-validating topology.json...[/dim]", spinner="dots"):
-                        is_valid, errors = validate_topology_file("topology.json", self.provider)
+                        is_valid, errors = validate_topology_data(topology, self.provider)
                 else:
-                    is_valid, errors = validate_topology_file("topology.json", self.provider)
+                    is_valid, errors = validate_topology_data(topology, self.provider)
 
                 if is_valid:
                     if RICH_AVAILABLE:
@@ -267,37 +342,20 @@ class TerraformGenerator:
             else:
                 return False
 
-        # Load validated topology into memory
-        try:
-            with open("topology.json", "r") as f:
-                self.topology = json.load(f)
-            if RICH_AVAILABLE and is_valid:
-                console.print("[green]✓[/green] Topology validated")
-            elif not RICH_AVAILABLE and is_valid:
-                print("Topology file is valid")
-            return True
-        except Exception as e:
-            if RICH_AVAILABLE:
-                console.print(f"[red]✗[/red] Error reading file: {str(e)}")
-            else:
-                print(f"\nError reading file: {str(e)}")
-            return False
+        # Keep the (possibly re-read) validated topology in memory
+        self.topology = topology
+        if RICH_AVAILABLE and is_valid:
+            console.print("[green]✓[/green] Topology validated")
+        elif not RICH_AVAILABLE and is_valid:
+            print("Topology file is valid")
+        return True
 
-    def _try_ai_autofix(self, errors: list) -> bool:
+    def _try_ai_autofix(self, current_topology: dict, errors: list) -> bool:
         """
         Attempt to fix topology errors using Dual-AI (OpenAI fix + Gemini review)
         Requires BOTH to pass before applying changes
         Falls back to single-AI (Gemini) if OpenAI not available
         """
-        # Load current topology for AI analysis
-        try:
-            with open("topology.json", "r") as f:
-                current_topology = json.load(f)
-        except Exception as e:
-            if RICH_AVAILABLE:
-                console.print(f"[red]Error reading topology:[/red] {str(e)}")
-            return False
-
         # Check for API keys
         openai_key = os.getenv("OPENAI_API_KEY")
         gemini_key = os.getenv("GEMINI_API_KEY")
@@ -597,21 +655,28 @@ class TerraformGenerator:
         """Build map of instance names to validated cloud resources (image, flavor)"""
         validated_map = {}
         if self.validated_resources and 'instances' in self.validated_resources:
-            for inst in self.validated_resources['instances']:
-                orig_name = inst['original_spec']['name']
-                full_name = f"{orig_name}_{suffix}" if suffix else orig_name
-
-                if self.provider == "openstack":
-                    validated_map[full_name] = {
+            # Resolve the provider dispatch once instead of re-comparing
+            # self.provider for every instance in the loop
+            if self.provider == "openstack":
+                def make_entry(inst):
+                    return {
                         "image": inst['image'],
                         "flavor": inst['flavor'],
                         "cloud_init": inst.get('cloud_init', None)
                     }
-                elif self.provider == "aws":
-                    validated_map[full_name] = {
+            elif self.provider == "aws":
+                def make_entry(inst):
+                    return {
                         "ami": inst['ami'],
                         "instance_type": inst['instance_type']
                     }
+            else:
+                return validated_map
+
+            for inst in self.validated_resources['instances']:
+                orig_name = inst['original_spec']['name']
+                full_name = f"{orig_name}_{suffix}" if suffix else orig_name
+                validated_map[full_name] = make_entry(inst)
         return validated_map
 
     def generate_config_content(self, validated_map, use_shared_vpc=False):
@@ -728,8 +793,7 @@ class TerraformGenerator:
 
     def generate_configs(self):
         """Generate Terraform project folders and run terraform apply"""
-        with open('topology.json', 'r') as f:
-            original_topology = json.load(f)
+        original_topology = self._load_json('topology.json')
 
         # Create timestamped project folder
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -780,11 +844,13 @@ class TerraformGenerator:
 
             # Modify topology with unique suffix
             modified_topology = modify_topology(original_topology, suffix)
-            with open(os.path.join(dir_path, 'topology.json'), 'w') as f:
-                json.dump(modified_topology, f, indent=2)
 
-            # Process cloud-init JSON -> YAML
-            self.process_cloud_init_configs(dir_path)
+            # Process cloud-init JSON -> YAML (updates the dict in memory)
+            self.process_cloud_init_configs(dir_path, modified_topology)
+
+            # Write topology.json once, with cloud-init references attached
+            with open(os.path.join(dir_path, 'topology.json'), 'wb') as f:
+                f.write(_json_dumps(modified_topology))
 
             # Generate main.tf with validated resources
             validated_map = self.build_validated_map(suffix)
@@ -816,13 +882,13 @@ class TerraformGenerator:
             if os.path.exists(dir_path):
                 shutil.rmtree(dir_path)
 
-    def process_cloud_init_configs(self, dir_path):
-        """Convert cloud-init JSON to YAML and attach to instances"""
-        try:
-            topology_path = os.path.join(dir_path, 'topology.json')
-            with open(topology_path, 'r') as f:
-                topology = json.load(f)
+    def process_cloud_init_configs(self, dir_path, topology):
+        """Convert cloud-init JSON to YAML and attach to instances
 
+        Mutates the passed topology dict in place; the caller writes it to
+        disk once afterwards instead of a write/read/rewrite round-trip.
+        """
+        try:
             # Process all instances, returns {instance_name: yaml_filename}
             cloud_init_map = cloud_init_processor.process_all_instances(
                 topology,
@@ -836,9 +902,6 @@ class TerraformGenerator:
                     if instance['name'] in cloud_init_map:
                         instance['cloud_init'] = cloud_init_map[instance['name']]
 
-                with open(topology_path, 'w') as f:
-                    json.dump(topology, f, indent=2)
-
         except Exception as e:
             print(f"  Warning: Could not process cloud-init configs: {e}")
 
@@ -871,20 +934,13 @@ class TerraformGenerator:
             )
             # Update username
             if 'openstack_user_name' in content:
-                import re
-                content = re.sub(
-                    r'(variable "openstack_user_name".*?default\s*=\s*)"[^"]*"',
-                    f'\\1"{self.openstack_config["username"]}"',
-                    content,
-                    flags=re.DOTALL
+                content = _VAR_DEFAULT_RES["openstack_user_name"].sub(
+                    f'\\1"{self.openstack_config["username"]}"', content
                 )
             # Update password
             if 'openstack_password' in content:
-                content = re.sub(
-                    r'(variable "openstack_password".*?default\s*=\s*)"[^"]*"',
-                    f'\\1"{self.openstack_config["password"]}"',
-                    content,
-                    flags=re.DOTALL
+                content = _VAR_DEFAULT_RES["openstack_password"].sub(
+                    f'\\1"{self.openstack_config["password"]}"', content
                 )
         
         # Update external network info if discovered
@@ -904,18 +960,12 @@ class TerraformGenerator:
         
         # Apply external network config
         if ext_net_id:
-            content = re.sub(
-                r'(variable "external_network_id".*?default\s*=\s*)"[^"]*"',
-                f'\\1"{ext_net_id}"',
-                content,
-                flags=re.DOTALL
+            content = _VAR_DEFAULT_RES["external_network_id"].sub(
+                f'\\1"{ext_net_id}"', content
             )
         if ext_net_name:
-            content = re.sub(
-                r'(variable "external_network_name".*?default\s*=\s*)"[^"]*"',
-                f'\\1"{ext_net_name}"',
-                content,
-                flags=re.DOTALL
+            content = _VAR_DEFAULT_RES["external_network_name"].sub(
+                f'\\1"{ext_net_name}"', content
             )
         
         # Write updated content
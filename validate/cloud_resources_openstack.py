@@ -2,6 +2,7 @@ import subprocess
 import json
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 
 # Import config manager từ module configs
@@ -61,25 +62,32 @@ def get_openstack_resources():
     images = []
     flavors = []
 
-    # Try to fetch images (non-fatal if it fails)
-    try:
-        images = json.loads(subprocess.check_output(
-            "openstack image list -f json", shell=True, text=True, timeout=50, env=env, stderr=subprocess.DEVNULL
+    def fetch(resource):
+        return json.loads(subprocess.check_output(
+            ["openstack", resource, "list", "-f", "json"], text=True, timeout=50, env=env, stderr=subprocess.DEVNULL
         ))
-    except subprocess.TimeoutExpired:
-        print("Warning: OpenStack image list timed out; skipping image validation.")
-    except Exception as e:
-        print(f"Warning: OpenStack image list failed ({e}); skipping image validation.")
 
-    # Try to fetch flavors separately
-    try:
-        flavors = json.loads(subprocess.check_output(
-            "openstack flavor list -f json", shell=True, text=True, timeout=50, env=env, stderr=subprocess.DEVNULL
-        ))
-    except subprocess.TimeoutExpired:
-        print("Warning: OpenStack flavor list timed out; cannot match cpu/ram/disk to flavor.")
-    except Exception as e:
-        print(f"Warning: OpenStack flavor list failed ({e}); cannot match cpu/ram/disk to flavor.")
+    # The image and flavor queries are independent API round-trips (several
+    # seconds each against a remote cloud) - run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        image_future = executor.submit(fetch, "image")
+        flavor_future = executor.submit(fetch, "flavor")
+
+        # Images are non-fatal if they fail
+        try:
+            images = image_future.result()
+        except subprocess.TimeoutExpired:
+            print("Warning: OpenStack image list timed out; skipping image validation.")
+        except Exception as e:
+            print(f"Warning: OpenStack image list failed ({e}); skipping image validation.")
+
+        # Flavors fetched separately, also non-fatal
+        try:
+            flavors = flavor_future.result()
+        except subprocess.TimeoutExpired:
+            print("Warning: OpenStack flavor list timed out; cannot match cpu/ram/disk to flavor.")
+        except Exception as e:
+            print(f"Warning: OpenStack flavor list failed ({e}); cannot match cpu/ram/disk to flavor.")
 
     if images or flavors:
         print(f"Found {len(images)} images and {len(flavors)} flavors")
@@ -7,10 +7,21 @@ Includes fuzzy matching for typo detection in network names
 import json
 import ipaddress
 import os
-import subprocess
-from jsonschema import validate, ValidationError
+import socket
 from typing import Tuple, List, Dict
+
+# jsonschema is imported lazily inside validate_topology_data() - it is the
+# heaviest import of this module and unused when only the IP/CIDR helpers
+# are needed
 from difflib import SequenceMatcher
+from functools import lru_cache
+
+# orjson is optional - C-accelerated JSON parsing, falls back to stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 # =============================================================================
@@ -116,17 +127,29 @@ TOPOLOGY_SCHEMA = {
 
 def validate_ip(ip: str) -> bool:
     """Check if string is a valid IPv4 address"""
+    # inet_pton is C-coded and strict dotted-quad (no shorthand, no leading
+    # zeros) - much cheaper than constructing an ipaddress.IPv4Address
     try:
-        ipaddress.IPv4Address(ip)
+        socket.inet_pton(socket.AF_INET, ip)
         return True
-    except ValueError:
+    except (OSError, TypeError):
         return False
 
 
+@lru_cache(maxsize=1024)
+def _parse_network(cidr: str) -> ipaddress.IPv4Network:
+    """Parse a CIDR string once and cache the network object
+
+    IPv4Network construction is relatively expensive, and the same few
+    CIDRs are re-checked for every instance/router IP in the topology.
+    """
+    return ipaddress.IPv4Network(cidr, strict=False)
+
+
 def validate_cidr(cidr: str) -> bool:
     """Check if string is a valid CIDR notation (e.g., 192.168.1.0/24)"""
     try:
-        ipaddress.IPv4Network(cidr, strict=False)
+        _parse_network(cidr)
         return True
     except ValueError:
         return False
@@ -135,7 +158,7 @@ def validate_cidr(cidr: str) -> bool:
 def check_ip_in_cidr(ip: str, cidr: str) -> bool:
     """Check if an IP address belongs to a CIDR range"""
     try:
-        return ipaddress.IPv4Address(ip) in ipaddress.IPv4Network(cidr, strict=False)
+        return ipaddress.IPv4Address(ip) in _parse_network(cidr)
     except ValueError:
         return False
 
@@ -152,8 +175,13 @@ def find_similar_name(name: str, valid_names: List[str], threshold: float = 0.6)
     """
     best_match = None
     best_ratio = 0
+    name_lower = name.lower()  # normalize once, not per candidate
+    matcher = SequenceMatcher(None, b=name_lower)
     for valid_name in valid_names:
-        ratio = SequenceMatcher(None, name.lower(), valid_name.lower()).ratio()
+        # SequenceMatcher caches stats for seq2, so keep name_lower there and
+        # only swap seq1 per candidate
+        matcher.set_seq1(valid_name.lower())
+        ratio = matcher.ratio()
         if ratio > best_ratio and ratio >= threshold:
             best_ratio = ratio
             best_match = valid_name
@@ -164,21 +192,23 @@ def find_similar_name(name: str, valid_names: List[str], threshold: float = 0.6)
 # Cloud-init File Validation
 # =============================================================================
 
+# Computed once at import - the directory never moves between calls
+CLOUD_INIT_GEN_DIR = os.path.join(os.path.dirname(__file__), "..", "generate", "userdata")
+
+
 def validate_cloud_init_file(cloud_init_path: str, provider: str) -> str:
     """
     Check if cloud-init JSON file exists in generate/userdata directory
     Returns error message if not found, None if valid
     """
-    cloud_init_gen_dir = os.path.join(os.path.dirname(__file__), "..", "generate", "userdata")
-
     # Try exact filename
-    full_path = os.path.join(cloud_init_gen_dir, cloud_init_path)
+    full_path = os.path.join(CLOUD_INIT_GEN_DIR, cloud_init_path)
     if os.path.isfile(full_path):
         return None
 
     # Try with .json extension
     if not cloud_init_path.endswith('.json'):
-        full_path_with_ext = os.path.join(cloud_init_gen_dir, f"{cloud_init_path}.json")
+        full_path_with_ext = os.path.join(CLOUD_INIT_GEN_DIR, f"{cloud_init_path}.json")
         if os.path.isfile(full_path_with_ext):
             return None
 
@@ -191,7 +221,44 @@ def validate_cloud_init_file(cloud_init_path: str, provider: str) -> str:
 
 def validate_topology_file(file_path: str, provider: str) -> Tuple[bool, List[str]]:
     """
-    Validate topology.json against schema and network logic
+    Validate a topology.json file against schema and network logic
+
+    Parses the file once and delegates to validate_topology_data() so
+    callers that already hold the parsed dict can skip the re-read.
+
+    Returns: (is_valid, list_of_errors)
+    """
+    # Step 1: Load JSON file
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+    except FileNotFoundError:
+        return False, ["File 'topology.json' not found"]
+    except ValueError as e:  # json.JSONDecodeError / orjson.JSONDecodeError
+        return False, [f"JSON syntax error: {str(e)}"]
+
+    return validate_topology_data(data, provider)
+
+
+# Compiled schema validator, built lazily on first use and reused afterwards
+# (jsonschema.validate() would recompile TOPOLOGY_SCHEMA on every call)
+_VALIDATOR = None
+
+
+def _schema_error(data: Dict):
+    """Validate data against TOPOLOGY_SCHEMA, return the best-match error or None"""
+    global _VALIDATOR
+    from jsonschema.exceptions import best_match
+    if _VALIDATOR is None:
+        from jsonschema import Draft202012Validator
+        _VALIDATOR = Draft202012Validator(TOPOLOGY_SCHEMA)
+    return best_match(_VALIDATOR.iter_errors(data))
+
+
+def validate_topology_data(data: Dict, provider: str) -> Tuple[bool, List[str]]:
+    """
+    Validate a parsed topology dict against schema and network logic
 
     Validation checks:
     1. JSON schema validation
@@ -207,22 +274,20 @@ def validate_topology_file(file_path: str, provider: str) -> Tuple[bool, List[st
     errors = []
     warnings = []
 
-    # Step 1: Load JSON file
-    try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        return False, ["File 'topology.json' not found"]
-    except json.JSONDecodeError as e:
-        return False, [f"JSON syntax error: {str(e)}"]
-
     # Step 2: Validate against JSON schema
-    try:
-        validate(instance=data, schema=TOPOLOGY_SCHEMA)
-    except ValidationError as e:
+    e = _schema_error(data)
+    if e is not None:
         path = ".".join(str(p) for p in e.path) if e.path else "root"
         errors.append(f"Schema error: {e.message} at {path}")
 
+    # Bail out on structurally broken input: with a required top-level list
+    # missing, the network-logic steps would only pile cascade errors
+    # ("network does not exist" for every instance) on top of the schema error
+    if not isinstance(data, dict) or not all(
+        key in data for key in ("instances", "networks", "routers")
+    ):
+        return False, errors
+
     # Step 3: Build network lookup and IP tracker
     network_info = {net["name"]: net for net in data.get("networks", [])}
     network_names = list(network_info.keys())
@@ -230,6 +295,9 @@ def validate_topology_file(file_path: str, provider: str) -> Tuple[bool, List[st
 
     # Step 4: Validate instances
     for instance in data.get("instances", []):
+        # Bind hot per-instance lookups to locals once; .get because a missing
+        # name is a schema error already reported above, not a crash
+        inst_name = instance.get("name")
         for net in instance.get("networks", []):
             net_name = net["name"]
             ip = net["ip"]
@@ -238,62 +306,51 @@ def validate_topology_file(file_path: str, provider: str) -> Tuple[bool, List[st
             if net_name not in network_info:
                 similar = find_similar_name(net_name, network_names)
                 if similar:
-                    errors.append(f"Instance '{instance['name']}': Network '{net_name}' does not exist (did you mean '{similar}'?)")
+                    errors.append(f"Instance '{inst_name}': Network '{net_name}' does not exist (did you mean '{similar}'?)")
                 else:
-                    errors.append(f"Instance '{instance['name']}': Network '{net_name}' does not exist")
+                    errors.append(f"Instance '{inst_name}': Network '{net_name}' does not exist")
                 continue
 
             # Validate IP format
             if not validate_ip(ip):
-                errors.append(f"Instance '{instance['name']}': IP '{ip}' is invalid")
+                errors.append(f"Instance '{inst_name}': IP '{ip}' is invalid")
                 continue
 
             # Check IP is within network CIDR
             cidr = network_info[net_name]["cidr"]
             if not check_ip_in_cidr(ip, cidr):
-                errors.append(f"Instance '{instance['name']}': IP '{ip}' is outside CIDR '{cidr}'")
+                errors.append(f"Instance '{inst_name}': IP '{ip}' is outside CIDR '{cidr}'")
 
-            # Check for duplicate IPs
-            if net_name not in used_ips:
-                used_ips[net_name] = set()
-            if ip in used_ips[net_name]:
-                errors.append(f"Instance '{instance['name']}': IP '{ip}' is duplicated in network '{net_name}'")
-            used_ips[net_name].add(ip)
+            # Check for duplicate IPs - add first and compare sizes, so the
+            # set hashes each IP once instead of a lookup followed by an add
+            net_used = used_ips.setdefault(net_name, set())
+            before = len(net_used)
+            net_used.add(ip)
+            if len(net_used) == before:
+                errors.append(f"Instance '{inst_name}': IP '{ip}' is duplicated in network '{net_name}'")
 
         # Validate cloud-init file if specified
         cloud_init_file = instance.get("cloud_init")
         if cloud_init_file:
             err = validate_cloud_init_file(cloud_init_file, provider)
             if err:
-                errors.append(f"Instance '{instance['name']}': {err}")
+                errors.append(f"Instance '{inst_name}': {err}")
 
         # Validate floating_ip format
         floating_ip = instance.get("floating_ip", None)
         if floating_ip is not None:
             if isinstance(floating_ip, str):
                 if not validate_ip(floating_ip):
-                    errors.append(f"Instance '{instance['name']}': floating_ip '{floating_ip}' is not a valid IP address")
+                    errors.append(f"Instance '{inst_name}': floating_ip '{floating_ip}' is not a valid IP address")
             elif not isinstance(floating_ip, bool):
-                errors.append(f"Instance '{instance['name']}': floating_ip must be an IP address (string) or true/false (boolean)")
-
-    # Step 5: Validate network gateway IPs
-    for net_name, network in network_info.items():
-        gw_ip = network.get("gateway_ip")
-
-        # Null/empty gateway_ip means "unspecified" (skip validation)
-        if gw_ip is None or gw_ip == "":
-            continue
-
-        if not validate_ip(gw_ip):
-            errors.append(f"Network '{net_name}': Gateway IP '{gw_ip}' is invalid")
-        elif not check_ip_in_cidr(gw_ip, network["cidr"]):
-            errors.append(f"Network '{net_name}': Gateway IP '{gw_ip}' is outside CIDR")
+                errors.append(f"Instance '{inst_name}': floating_ip must be an IP address (string) or true/false (boolean)")
 
     # Step 6: Validate routers
     router_ips = {}  # {network_name: set(ips)} - track router IPs for duplicate detection
     router_interface_ips = {}  # {network_name: router_ip} - for gateway validation
 
     for router in data.get("routers", []):
+        router_name = router.get("name")
         for net in router.get("networks", []):
             net_name = net["name"]
             ip = net["ip"]
@@ -302,38 +359,40 @@ def validate_topology_file(file_path: str, provider: str) -> Tuple[bool, List[st
             if net_name not in network_info:
                 similar = find_similar_name(net_name, network_names)
                 if similar:
-                    errors.append(f"Router '{router['name']}': Network '{net_name}' does not exist (did you mean '{similar}'?)")
+                    errors.append(f"Router '{router_name}': Network '{net_name}' does not exist (did you mean '{similar}'?)")
                 else:
-                    errors.append(f"Router '{router['name']}': Network '{net_name}' does not exist")
+                    errors.append(f"Router '{router_name}': Network '{net_name}' does not exist")
                 continue
 
             # Validate IP format
             if not validate_ip(ip):
-                errors.append(f"Router '{router['name']}': IP '{ip}' is invalid")
+                errors.append(f"Router '{router_name}': IP '{ip}' is invalid")
                 continue
 
             # Check router IP is within network CIDR
             cidr = network_info[net_name]["cidr"]
             if not check_ip_in_cidr(ip, cidr):
-                errors.append(f"Router '{router['name']}': IP '{ip}' is outside network '{net_name}' CIDR '{cidr}'")
+                errors.append(f"Router '{router_name}': IP '{ip}' is outside network '{net_name}' CIDR '{cidr}'")
                 continue
 
-            # Check for duplicate router IPs in same network
-            if net_name not in router_ips:
-                router_ips[net_name] = set()
-            if ip in router_ips[net_name]:
-                errors.append(f"Router '{router['name']}': IP '{ip}' is already used by another router in network '{net_name}'")
-            router_ips[net_name].add(ip)
+            # Check for duplicate router IPs in same network (same
+            # add-then-compare trick as the instance IPs above)
+            net_router_ips = router_ips.setdefault(net_name, set())
+            before = len(net_router_ips)
+            net_router_ips.add(ip)
+            if len(net_router_ips) == before:
+                errors.append(f"Router '{router_name}': IP '{ip}' is already used by another router in network '{net_name}'")
 
             # Check router IP doesn't conflict with instance IPs
             if net_name in used_ips and ip in used_ips[net_name]:
-                errors.append(f"Router '{router['name']}': IP '{ip}' conflicts with an instance IP in network '{net_name}'")
+                errors.append(f"Router '{router_name}': IP '{ip}' conflicts with an instance IP in network '{net_name}'")
 
             # Track router interface IP for gateway validation
             router_interface_ips[net_name] = ip
 
-    # Step 6.5: Validate gateway_ip matches router interface IP
-    # CRITICAL: VMs use gateway_ip as default gateway, must match router interface
+    # Step 6.5: Validate network gateway IPs in a single pass: validity,
+    # CIDR membership, and match against the router interface IP
+    # (needs router_interface_ips, so this runs after the router loop)
     for net_name, network in network_info.items():
         gw_ip = network.get("gateway_ip")
 
@@ -341,6 +400,12 @@ def validate_topology_file(file_path: str, provider: str) -> Tuple[bool, List[st
         if gw_ip is None or gw_ip == "":
             continue
 
+        if not validate_ip(gw_ip):
+            errors.append(f"Network '{net_name}': Gateway IP '{gw_ip}' is invalid")
+        elif not check_ip_in_cidr(gw_ip, network["cidr"]):
+            errors.append(f"Network '{net_name}': Gateway IP '{gw_ip}' is outside CIDR")
+
+        # CRITICAL: VMs use gateway_ip as default gateway, must match router interface
         if net_name in router_interface_ips:
             router_ip = router_interface_ips[net_name]
             if gw_ip != router_ip:
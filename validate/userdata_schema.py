@@ -1,9 +1,25 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import argparse
 import json
+import os
 import sys
-from jsonschema import Draft202012Validator, exceptions as js_exceptions
-from typing import List, Dict, Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Callable, TYPE_CHECKING
+
+# jsonschema is imported lazily in collect_errors() so that argparse errors
+# and --help do not pay its ~40ms import cost; the annotations still need the
+# name, but only when a type checker is looking
+if TYPE_CHECKING:
+    from jsonschema import exceptions as js_exceptions
+
+# orjson is optional - C-accelerated JSON parsing, falls back to stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 # Schema definition for validating user data JSON
@@ -1358,8 +1374,27 @@ USER_DATA_SCHEMA = {
     }
   ]
 }
- 
- 
+
+
+def _intern_schema(obj):
+    """Rebuild the schema with all strings interned.
+
+    The schema literal repeats the same short strings ("type", "string",
+    "pattern", ...) hundreds of times; interning them lets CPython's dict
+    lookups hit the pointer-equality fast path during validation.
+    """
+    if isinstance(obj, dict):
+        return {sys.intern(k): _intern_schema(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_intern_schema(v) for v in obj]
+    if isinstance(obj, str):
+        return sys.intern(obj)
+    return obj
+
+
+USER_DATA_SCHEMA = _intern_schema(USER_DATA_SCHEMA)
+
+
 ERROR_MESSAGES: Dict[str, Callable] = {
     'required': lambda err: f"Missing required field: '{list(err.validator_value)[0]}'. Please add this field to your configuration.",
     'enum': lambda err: f"Invalid value '{err.instance}'. Allowed values are: {', '.join(map(str, err.validator_value))}",
@@ -1388,7 +1423,7 @@ def format_path(error: js_exceptions.ValidationError) -> str:
     """Format error path for display"""
     if not error.absolute_path:
         return "(root)"
-    return "/".join(str(p) for p in error.absolute_path)
+    return "/".join(map(str, error.absolute_path))
 
 def get_custom_message(error: js_exceptions.ValidationError) -> str:
     """Get custom error message or fallback to default"""
@@ -1411,11 +1446,125 @@ def get_custom_message(error: js_exceptions.ValidationError) -> str:
     # Fallback to original message
     return error.message
 
-def collect_errors(instance) -> List[js_exceptions.ValidationError]:
-    validator = Draft202012Validator(USER_DATA_SCHEMA)
-    errors = sorted(validator.iter_errors(instance), key=lambda e: (list(e.absolute_path), e.message))
+# Top-level arrays whose items are independent of each other; only these are
+# worth farming out to worker processes, and only when they are large enough
+# that validation time beats the process/IPC overhead
+_PARALLEL_ARRAYS = ("files", "users", "package")
+_PARALLEL_MIN_ITEMS = 512
+
+
+def _err_record(err, top: bool = True) -> tuple:
+    """Flatten a ValidationError into picklable primitives.
+
+    ValidationError instances cannot cross the process boundary - their args
+    reference the type checker's lambdas - so only the fields the error
+    report reads are sent back. Context errors keep their relative paths;
+    parent linkage restores the absolute ones on rebuild.
+    """
+    return (
+        tuple(err.absolute_path if top else err.relative_path),
+        err.message,
+        err.validator,
+        err.validator_value,
+        err.instance,
+        tuple(_err_record(c, top=False) for c in err.context) if err.context else (),
+    )
+
+
+def _rebuild_error(record: tuple) -> js_exceptions.ValidationError:
+    """Reassemble a worker's error record into a real ValidationError."""
+    from jsonschema.exceptions import ValidationError
+
+    path, message, validator, validator_value, instance, context = record
+    return ValidationError(
+        message,
+        validator=validator,
+        validator_value=validator_value,
+        instance=instance,
+        path=path,
+        context=[_rebuild_error(c) for c in context],
+    )
+
+
+def _validate_chunk(items_schema: dict, prop: str, start: int, items: list):
+    """Validate one chunk of a large array in a worker process.
+
+    Error paths are rewritten to (prop, absolute_index, ...) so they match
+    what a full-document validation would have reported.
+    """
+    from jsonschema import Draft202012Validator
+
+    validator = Draft202012Validator(items_schema)
+    errors = []
+    for offset, item in enumerate(items):
+        for err in validator.iter_errors(item):
+            err.path.extendleft([start + offset, prop])
+            errors.append(_err_record(err))
     return errors
 
+
+def _validate_arrays_parallel(arrays: Dict[str, list]) -> list:
+    """Validate items[1:] of each large array across CPU cores."""
+    workers = os.cpu_count() or 1
+    errors = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for prop, items in arrays.items():
+            items_schema = USER_DATA_SCHEMA["properties"][prop]["items"]
+            # Item 0 is validated in-document (keeps minItems etc. intact)
+            chunk_size = max(1, (len(items) - 1 + workers - 1) // workers)
+            for start in range(1, len(items), chunk_size):
+                futures.append(pool.submit(
+                    _validate_chunk, items_schema, prop, start,
+                    items[start:start + chunk_size]
+                ))
+        for future in futures:
+            errors.extend(_rebuild_error(record) for record in future.result())
+    return errors
+
+
+# Compiled validator, built once on first use (after the lazy jsonschema
+# import) and reused for every document
+_VALIDATOR = None
+
+
+def _get_validator():
+    global _VALIDATOR
+    if _VALIDATOR is None:
+        from jsonschema import Draft202012Validator
+
+        _VALIDATOR = Draft202012Validator(USER_DATA_SCHEMA)
+    return _VALIDATOR
+
+
+def collect_errors(instance) -> List[js_exceptions.ValidationError]:
+    # Large independent arrays are validated per-item in worker processes;
+    # the rest of the document (including item 0 of each array, so minItems
+    # and the allOf conditionals still see a non-empty array) stays serial
+    large_arrays = {}
+    if isinstance(instance, dict):
+        for prop in _PARALLEL_ARRAYS:
+            value = instance.get(prop)
+            items_schema = USER_DATA_SCHEMA["properties"].get(prop, {}).get("items")
+            if isinstance(value, list) and len(value) >= _PARALLEL_MIN_ITEMS and items_schema:
+                large_arrays[prop] = value
+
+    validator = _get_validator()
+    if large_arrays:
+        trimmed = dict(instance)
+        for prop, value in large_arrays.items():
+            trimmed[prop] = value[:1]
+        errors = list(validator.iter_errors(trimmed))
+        errors.extend(_validate_arrays_parallel(large_arrays))
+    else:
+        errors = list(validator.iter_errors(instance))
+    # Pre-extract sort keys once (tuples, not lists) instead of calling a key
+    # lambda per comparison - avoids re-materializing absolute_path for every
+    # comparison on heavily invalid files
+    keys = [(tuple(e.absolute_path), e.message) for e in errors]
+    order = sorted(range(len(errors)), key=keys.__getitem__)
+    return [errors[i] for i in order]
+
 def validate(json_path: str) -> bool:
     """
     Validate a JSON file against USER_DATA_SCHEMA.
@@ -1427,8 +1576,11 @@ def validate(json_path: str) -> bool:
         True if valid, False otherwise
     """
     try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(json_path, "rb") as f:
+            raw = f.read()
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the
+        # lineno/colno error report below works for both parsers
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
     except FileNotFoundError:
         print(f"Error: file not found: {json_path}", file=sys.stderr)
         return False
@@ -1442,25 +1594,36 @@ def validate(json_path: str) -> bool:
         print("✓ Valid JSON: conforms to USER_DATA_SCHEMA.")
         return True
 
-    print(f"✗ Found {len(errors)} validation error(s):")
+    # Batch the whole report into a single stdout write: one flush/lock
+    # instead of 3-4 per error, which adds up on files with hundreds of errors
+    parts = [f"✗ Found {len(errors)} validation error(s):\n"]
     for i, err in enumerate(errors, 1):
         path = format_path(err)
         custom_msg = get_custom_message(err)
-        
-        print(f"\n[{i}] At: {path}")
-        print(f"    Error: {custom_msg}")
-        # print(f"    Value: {repr(err.instance)}")
+
+        parts.append(f"\n[{i}] At: {path}\n")
+        parts.append(f"    Error: {custom_msg}\n")
 
         # Show original message if different
         if custom_msg != err.message:
-            print(f"    Detail: {err.message}")
+            parts.append(f"    Detail: {err.message}\n")
 
-        # Show context hints
+        # Show context hints: stop as soon as 3 distinct messages are found
+        # instead of formatting and sorting every context error (deep
+        # anyOf/oneOf branches can spawn dozens per item)
         if err.context:
-            sub_msgs = sorted({get_custom_message(c) for c in err.context})
-            for sm in sub_msgs[:3]:  # Limit to 3 hints
-                print(f"    Hint: {sm}")
+            seen = set()
+            hints = []
+            for c in err.context:
+                sub_msg = get_custom_message(c)
+                if sub_msg not in seen:
+                    seen.add(sub_msg)
+                    hints.append(sub_msg)
+                    if len(hints) == 3:  # Limit to 3 hints
+                        break
+            parts.extend(f"    Hint: {sm}\n" for sm in hints)
 
+    sys.stdout.write("".join(parts))
     return False
 
 if __name__ == "__main__":